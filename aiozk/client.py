@@ -1,21 +1,39 @@
 import asyncio
+import functools
 import logging
-import re
 import typing
 
 from asyncio_toolkit import utils
 from asyncio_toolkit.delay_pool import DelayPool
-from asyncio_toolkit.typing import BytesLike
+from asyncio_toolkit.typing import BytesLike, Coroutine
 
 from . import errors
 from . import protocol
 from . import session
+from .record import get_size
 
 
 ServerAddress = typing.Tuple[str, int]
 
+_WatcherTypes = typing.Dict[typing.Optional[typing.Type[errors.Error]], session.WatcherType]
+
 
 class Client:
+    __slots__ = (
+        "_session",
+        "_loop",
+        "_logger",
+        "_server_addresses",
+        "_path_prefix",
+        "_auth_infos",
+        "_default_acl",
+        "_auto_batch",
+        "_batch_coalescer",
+        "_starting",
+        "_running",
+        "_is_stopping",
+    )
+
     def __init__(self, *,
         loop: typing.Optional[asyncio.AbstractEventLoop]=None,
         logger: typing.Optional[logging.Logger]=None,
@@ -24,17 +42,25 @@ class Client:
         path_prefix="/",
         auth_infos: typing.Iterable[session.AuthInfo]=(),
         default_acl: typing.Iterable[protocol.ACL]=(protocol.Ids.OPEN_ACL_UNSAFE,),
+        auto_batch=False,
+        max_batch_size=128,
+        max_batch_delay=0.0,
     ) -> None:
         self._session = session.Session(loop, logger, session_timeout)
+        self._loop = self._session.get_loop()
+        self._logger = self._session.get_logger()
         self._server_addresses = DelayPool(server_addresses, 1.0, session_timeout
-                                           , self.get_loop(), self.get_logger())
+                                           , self._loop, self._logger)
         assert path_prefix.startswith("/"), repr(path_prefix)
-        self._path_prefix = _RE1.sub("/", path_prefix + "/")
+        self._path_prefix = _collapse_slashes(path_prefix + "/")
         self._auth_infos = set(auth_infos)
         self._default_acl = tuple(default_acl)
         assert len(self._default_acl) >= 1
-        self._starting: typing.Optional[utils.Future[None]] = None
-        self._running: asyncio.Future[None] = utils.make_done_future(self.get_loop())
+        self._auto_batch = auto_batch
+        self._batch_coalescer = _BatchCoalescer(self._session, max_batch_size, max_batch_delay)
+        self._starting: typing.Optional[asyncio.Future[None]] = None
+        self._running: asyncio.Future[None] = self._loop.create_future()
+        self._running.set_result(None)
         self._is_stopping = False
 
     def add_session_listener(self) -> session.SessionListener:
@@ -50,8 +76,8 @@ class Client:
             await utils.shield(self._starting)
             return
 
-        self._starting = utils.Future(loop=self.get_loop())
-        running = self.get_loop().create_task(self._run())
+        self._starting = self._loop.create_future()
+        running = self._loop.create_task(self._run())
         session_listener = self._session.add_listener()
 
         try:
@@ -78,86 +104,71 @@ class Client:
 
     def normalize_path(self, path: str) -> str:
         assert len(path) >= 1
-        path = _RE1.sub("/", path + "/")
-
-        if path[0] == "/":
-            if path != "/":
-                path = path[:-1]
-        else:
-            path = self._path_prefix + path[:-1]
+        return _normalize_path(path, self._path_prefix)
 
-        return path
-
-    def create_op(self, path: str, data: BytesLike=b"", acl: typing.Iterable\
-        [protocol.ACL]=(), ephemeral=False, sequential=False) -> protocol.Op:
+    def create_op(self, path: str, data: BytesLike=b"", acl: typing.Optional[typing.Iterable\
+        [protocol.ACL]]=None, ephemeral=False, sequential=False) -> protocol.Op:
         path = self.normalize_path(path)
 
-        if acl is ():
+        if not acl:
             acl = self._default_acl
 
-        if ephemeral:
-            if sequential:
-                flags = protocol.CreateMode.EPHEMERAL_SEQUENTIAL
-            else:
-                flags = protocol.CreateMode.EPHEMERAL
-        else:
-            if sequential:
-                flags = protocol.CreateMode.PERSISTENT_SEQUENTIAL
-            else:
-                flags = protocol.CreateMode.PERSISTENT
-
-        return protocol.OpCode.CREATE, protocol.CreateRequest(
+        return _OP_CREATE, protocol.CreateRequest(
             path=path,
-            data=bytes(data),
-            acl=tuple(acl),
-            flags=flags,
+            data=data if type(data) is bytes else bytes(data),
+            acl=acl if type(acl) is tuple else tuple(acl),
+            flags=_CREATE_FLAGS[ephemeral][sequential],
         )
 
-    async def create(self, *args, **kwargs) -> protocol.CreateResponse:
+    def create(self, *args, **kwargs) -> Coroutine[protocol.CreateResponse]:
         auto_retry = kwargs.pop("auto_retry", False)
-        return await self._session.execute_operation(*self.create_op(*args, **kwargs), auto_retry)
+        auto_batch = kwargs.pop("auto_batch", self._auto_batch)
+        return self._execute_op(self.create_op(*args, **kwargs), auto_retry, auto_batch)
 
     def delete_op(self, path: str, version=-1) -> protocol.Op:
         path = self.normalize_path(path)
 
-        return protocol.OpCode.DELETE, protocol.DeleteRequest(
+        return _OP_DELETE, protocol.DeleteRequest(
             path=path,
             version=version,
         )
 
-    async def delete(self, *args, **kwargs) -> None:
+    def delete(self, *args, **kwargs) -> Coroutine[None]:
         auto_retry = kwargs.pop("auto_retry", False)
-        await self._session.execute_operation(*self.delete_op(*args, **kwargs), auto_retry)
+        auto_batch = kwargs.pop("auto_batch", self._auto_batch)
+        return self._execute_op(self.delete_op(*args, **kwargs), auto_retry, auto_batch)
 
-    def set_data_op(self, path: str, data: bytes, version=-1) -> protocol.Op:
+    def set_data_op(self, path: str, data: BytesLike, version=-1) -> protocol.Op:
         path = self.normalize_path(path)
 
-        return protocol.OpCode.SET_DATA, protocol.SetDataRequest(
+        return _OP_SET_DATA, protocol.SetDataRequest(
             path=path,
-            data=data,
+            data=data if type(data) is bytes else bytes(data),
             version=version,
         )
 
-    async def set_data(self, *args, **kwargs) -> protocol.SetDataResponse:
+    def set_data(self, *args, **kwargs) -> Coroutine[protocol.SetDataResponse]:
         auto_retry = kwargs.pop("auto_retry", False)
-        return await self._session.execute_operation(*self.set_data_op(*args, **kwargs), auto_retry)
+        auto_batch = kwargs.pop("auto_batch", self._auto_batch)
+        return self._execute_op(self.set_data_op(*args, **kwargs), auto_retry, auto_batch)
 
     def check_op(self, path: str, version=-1) -> protocol.Op:
         path = self.normalize_path(path)
 
-        return protocol.OpCode.CHECK, protocol.CheckVersionRequest(
+        return _OP_CHECK, protocol.CheckVersionRequest(
             path=path,
             version=version,
         )
 
-    async def check(self, *args, **kwargs) -> None:
+    def check(self, *args, **kwargs) -> Coroutine[None]:
         auto_retry = kwargs.pop("auto_retry", False)
-        await self._session.execute_operation(*self.check_op(*args, **kwargs), auto_retry)
+        auto_batch = kwargs.pop("auto_batch", self._auto_batch)
+        return self._execute_op(self.check_op(*args, **kwargs), auto_retry, auto_batch)
 
-    async def multi(self, ops: typing.Iterable[protocol.Op], *
-                    , auto_retry=False) -> protocol.MultiResponse:
-        return await self._session.execute_operation(
-            protocol.OpCode.MULTI,
+    def multi(self, ops: typing.Iterable[protocol.Op], *
+              , auto_retry=False) -> Coroutine[protocol.MultiResponse]:
+        return self._session.execute_operation(
+            _OP_MULTI,
 
             protocol.MultiRequest(
                 ops=tuple(ops),
@@ -166,12 +177,12 @@ class Client:
             auto_retry,
         )
 
-    async def exists(self, path: str, *
-                     , auto_retry=False) -> typing.Optional[protocol.ExistsResponse]:
+    def exists(self, path: str, *
+               , auto_retry=False) -> Coroutine[typing.Optional[protocol.ExistsResponse]]:
         path = self.normalize_path(path)
 
-        return await self._session.execute_operation(
-            protocol.OpCode.EXISTS,
+        return self._session.execute_operation(
+            _OP_EXISTS,
 
             protocol.ExistsRequest(
                 path=path,
@@ -182,27 +193,12 @@ class Client:
             (errors.NoNodeError,),
         )
 
-    async def exists_w(self, path: str, *, auto_retry=False) -> typing.Tuple[typing\
-        .Optional[protocol.ExistsResponse], session.Watcher]:
+    def exists_w(self, path: str, *, auto_retry=False) -> Coroutine[typing.Tuple[typing\
+        .Optional[protocol.ExistsResponse], session.Watcher]]:
         path = self.normalize_path(path)
-        watcher = None
-
-        def on_operation_complete(non_error_class: typing.Optional[typing.Type[errors\
-            .Error]]) -> None:
-            nonlocal watcher
-
-            if non_error_class is None:
-                watcher_type = session.WatcherType.DATA
-            elif non_error_class is errors.NoNodeError:
-                watcher_type = session.WatcherType.EXIST
-            else:
-                assert False, repr(non_error_class)
-
-            watcher = session.Watcher(watcher_type, path, self.get_loop())
-            self._session.add_watcher(watcher)
 
-        result = await self._session.execute_operation(
-            protocol.OpCode.EXISTS,
+        return self._execute_watch_operation(
+            _OP_EXISTS,
 
             protocol.ExistsRequest(
                 path=path,
@@ -211,17 +207,14 @@ class Client:
 
             auto_retry,
             (errors.NoNodeError,),
-            on_operation_complete,
+            _EXISTS_WATCHER_TYPES,
         )
 
-        assert watcher is not None
-        return result, watcher
-
-    async def get_data(self, path: str, *, auto_retry=False) -> protocol.GetDataResponse:
+    def get_data(self, path: str, *, auto_retry=False) -> Coroutine[protocol.GetDataResponse]:
         path = self.normalize_path(path)
 
-        return await self._session.execute_operation(
-            protocol.OpCode.GET_DATA,
+        return self._session.execute_operation(
+            _OP_GET_DATA,
 
             protocol.GetDataRequest(
                 path=path,
@@ -231,19 +224,12 @@ class Client:
             auto_retry,
         )
 
-    async def get_data_w(self, path: str, *, auto_retry=False) -> typing.Tuple[protocol\
-        .GetDataResponse, session.Watcher]:
+    def get_data_w(self, path: str, *, auto_retry=False) -> Coroutine[typing.Tuple[protocol\
+        .GetDataResponse, session.Watcher]]:
         path = self.normalize_path(path)
-        watcher = None
-
-        def on_operation_complete(non_error_class: typing.Optional[typing.Type[errors\
-            .Error]]) -> None:
-            nonlocal watcher
-            watcher = session.Watcher(session.WatcherType.DATA, path, self.get_loop())
-            self._session.add_watcher(watcher)
 
-        result = await self._session.execute_operation(
-            protocol.OpCode.GET_DATA,
+        return self._execute_watch_operation(
+            _OP_GET_DATA,
 
             protocol.GetDataRequest(
                 path=path,
@@ -252,17 +238,15 @@ class Client:
 
             auto_retry,
             (),
-            on_operation_complete,
+            _GET_DATA_WATCHER_TYPES,
         )
 
-        assert watcher is not None
-        return result, watcher
-
-    async def get_children(self, path: str, *, auto_retry=False) -> protocol.GetChildrenResponse:
+    def get_children(self, path: str, *, auto_retry=False) -> Coroutine[protocol\
+        .GetChildrenResponse]:
         path = self.normalize_path(path)
 
-        return await self._session.execute_operation(
-            protocol.OpCode.GET_CHILDREN,
+        return self._session.execute_operation(
+            _OP_GET_CHILDREN,
 
             protocol.GetChildrenRequest(
                 path=path,
@@ -272,19 +256,12 @@ class Client:
             auto_retry,
         )
 
-    async def get_children_w(self, path: str, *, auto_retry=False) -> typing.Tuple[protocol\
-        .GetChildrenResponse, session.Watcher]:
+    def get_children_w(self, path: str, *, auto_retry=False) -> Coroutine[typing.Tuple[protocol\
+        .GetChildrenResponse, session.Watcher]]:
         path = self.normalize_path(path)
-        watcher = None
-
-        def on_operation_complete(non_error_class: typing.Optional[typing.Type[errors\
-            .Error]]) -> None:
-            nonlocal watcher
-            watcher = session.Watcher(session.WatcherType.CHILD, path, self.get_loop())
-            self._session.add_watcher(watcher)
 
-        result = await self._session.execute_operation(
-            protocol.OpCode.GET_CHILDREN,
+        return self._execute_watch_operation(
+            _OP_GET_CHILDREN,
 
             protocol.GetChildrenRequest(
                 path=path,
@@ -293,17 +270,15 @@ class Client:
 
             auto_retry,
             (),
-            on_operation_complete,
+            _GET_CHILDREN_WATCHER_TYPES,
         )
 
-        assert watcher is not None
-        return result, watcher
-
-    async def get_children2(self, path: str, *, auto_retry=False) -> protocol.GetChildren2Response:
+    def get_children2(self, path: str, *, auto_retry=False) -> Coroutine[protocol\
+        .GetChildren2Response]:
         path = self.normalize_path(path)
 
-        return await self._session.execute_operation(
-            protocol.OpCode.GET_CHILDREN2,
+        return self._session.execute_operation(
+            _OP_GET_CHILDREN2,
 
             protocol.GetChildrenRequest(
                 path=path,
@@ -313,19 +288,12 @@ class Client:
             auto_retry,
         )
 
-    async def get_children2_w(self, path: str, *, auto_retry=False) -> typing.Tuple[protocol\
-        .GetChildren2Response, session.Watcher]:
+    def get_children2_w(self, path: str, *, auto_retry=False) -> Coroutine[typing.Tuple\
+        [protocol.GetChildren2Response, session.Watcher]]:
         path = self.normalize_path(path)
-        watcher = None
-
-        def on_operation_complete(non_error_class: typing.Optional[typing.Type[errors\
-            .Error]]) -> None:
-            nonlocal watcher
-            watcher = session.Watcher(session.WatcherType.CHILD, path, self.get_loop())
-            self._session.add_watcher(watcher)
 
-        result = await self._session.execute_operation(
-            protocol.OpCode.GET_CHILDREN2,
+        return self._execute_watch_operation(
+            _OP_GET_CHILDREN2,
 
             protocol.GetChildrenRequest(
                 path=path,
@@ -334,17 +302,14 @@ class Client:
 
             auto_retry,
             (),
-            on_operation_complete,
+            _GET_CHILDREN_WATCHER_TYPES,
         )
 
-        assert watcher is not None
-        return result, watcher
-
-    async def get_acl(self, path: str, *, auto_retry=False) -> protocol.GetACLResponse:
+    def get_acl(self, path: str, *, auto_retry=False) -> Coroutine[protocol.GetACLResponse]:
         path = self.normalize_path(path)
 
-        return await self._session.execute_operation(
-            protocol.OpCode.GET_ACL,
+        return self._session.execute_operation(
+            _OP_GET_ACL,
 
             protocol.GetACLRequest(
                 path=path,
@@ -353,30 +318,30 @@ class Client:
             auto_retry,
         )
 
-    async def set_acl(self, path: str, acl: typing.Iterable[protocol.ACL]=(), version=-1, *
-                      , auto_retry=False) -> protocol.SetACLResponse:
+    def set_acl(self, path: str, acl: typing.Optional[typing.Iterable[protocol.ACL]]=None
+                , version=-1, *, auto_retry=False) -> Coroutine[protocol.SetACLResponse]:
         path = self.normalize_path(path)
 
-        if acl is ():
+        if not acl:
             acl = self._default_acl
 
-        return await self._session.execute_operation(
-            protocol.OpCode.SET_ACL,
+        return self._session.execute_operation(
+            _OP_SET_ACL,
 
             protocol.SetACLRequest(
                 path=path,
-                acl=tuple(acl),
+                acl=acl if type(acl) is tuple else tuple(acl),
                 version=version,
             ),
 
             auto_retry,
         )
 
-    async def sync(self, path: str, *, auto_retry=False) -> protocol.SyncResponse:
+    def sync(self, path: str, *, auto_retry=False) -> Coroutine[protocol.SyncResponse]:
         path = self.normalize_path(path)
 
-        return await self._session.execute_operation(
-            protocol.OpCode.SYNC,
+        return self._session.execute_operation(
+            _OP_SYNC,
 
             protocol.SyncRequest(
                 path=path,
@@ -391,42 +356,115 @@ class Client:
         if path == "/":
             return
 
-        node_names = path[1:].split("/")
+        # reads are served by the connected server without going through the leader,
+        # so probe first and skip the multi-create in the common case
+        if await self.exists(path, auto_retry=True) is not None:
+            return
+
+        # the path is normalized, so every "/" but the leading one ends an ancestor path
+        paths = [path[:i] for i in range(1, len(path)) if path[i] == "/"]
+        paths.append(path)
+
+        # paths[:min_number_of_existing_paths] are known to exist
+        # and paths[max_number_of_existing_paths:] are known to be missing
+        min_number_of_existing_paths = 0
+        max_number_of_existing_paths = len(paths) - 1
 
         while True:
-            path = ""
-
-            try:
-                for node_name in node_names:
-                    path += "/" + node_name
-
-                    try:
-                        await self.create(path, auto_retry=True)
-                    except errors.NodeExistsError:
-                        pass
-            except errors.NoNodeError:
-                pass
-            else:
+            # a node never exists without its ancestors, so binary-search the deepest existing
+            # one with reads rather than walking up the path with failed multi-creates
+            while min_number_of_existing_paths < max_number_of_existing_paths:
+                number_of_existing_paths = (min_number_of_existing_paths
+                                            + max_number_of_existing_paths + 1) // 2
+
+                if await self.exists(paths[number_of_existing_paths - 1]
+                                     , auto_retry=True) is None:
+                    max_number_of_existing_paths = number_of_existing_paths - 1
+                else:
+                    min_number_of_existing_paths = number_of_existing_paths
+
+            if min_number_of_existing_paths == len(paths):
+                return
+
+            ops = [self.create_op(path) for path in paths[min_number_of_existing_paths:]]
+            multi_response = await self.multi(ops, auto_retry=True)
+            failed_op = _find_failed_op(multi_response)
+
+            if failed_op is None:
                 return
 
+            failed_op_index, error_class = failed_op
+
+            if error_class is errors.NodeExistsError:
+                # every other node has a missing parent, so only the first one can have been
+                # created in the meantime, whereas its descendants may have been as well
+                assert failed_op_index == 0, failed_op_index
+                min_number_of_existing_paths += 1
+                max_number_of_existing_paths = len(paths)
+            elif error_class is errors.NoNodeError:
+                # some ancestor has been deleted in the meantime, start over
+                min_number_of_existing_paths = 0
+                max_number_of_existing_paths = len(paths)
+            else:
+                error_message = "request: {!r}".format(ops[failed_op_index][1])
+                raise error_class(error_message)
+
     async def delete_r(self, path: str) -> None:
         path = self.normalize_path(path)
 
         while True:
-            try:
-                children, = await self.get_children(path, auto_retry=True)
-            except errors.NoNodeError:
-                return
+            # list the subtree level by level, a node always comes before its descendants
+            paths = []
+            unlisted_paths = [path]
 
-            for child in children:
-                await self.delete_r(path + "/" + child)
+            while len(unlisted_paths) >= 1:
+                next_unlisted_paths: typing.List[str] = []
 
-            try:
-                await self.delete(path, auto_retry=True)
-            except errors.NotEmptyError:
-                pass
-            except errors.NoNodeError:
-                return
+                for i in range(0, len(unlisted_paths), _MAX_DELETE_R_CONCURRENCY):
+                    paths2 = unlisted_paths[i:i + _MAX_DELETE_R_CONCURRENCY]
+
+                    results = await asyncio.gather(
+                        *(self.get_children(path2, auto_retry=True) for path2 in paths2),
+                        return_exceptions=True,
+                    )
+
+                    for path2, result in zip(paths2, results):
+                        if isinstance(result, errors.NoNodeError):
+                            continue
+
+                        if isinstance(result, BaseException):
+                            raise result
+
+                        children, = result
+                        paths.append(path2)
+                        next_unlisted_paths.extend(path2 + "/" + child for child in children)
+
+                unlisted_paths = next_unlisted_paths
+
+            # then delete it bottom-up in batches
+            paths.reverse()
+            i = 0
+
+            while i < len(paths):
+                ops = [self.delete_op(path2) for path2 in paths[i:i + _MAX_DELETE_R_BATCH_SIZE]]
+                multi_response = await self.multi(ops, auto_retry=True)
+                failed_op = _find_failed_op(multi_response)
+
+                if failed_op is None:
+                    i += len(ops)
+                    continue
+
+                failed_op_index, error_class = failed_op
+
+                if error_class is errors.NoNodeError:
+                    # the node has been deleted in the meantime, retry the others
+                    del paths[i + failed_op_index]
+                elif error_class is errors.NotEmptyError:
+                    # children have been added in the meantime, go through the subtree again
+                    break
+                else:
+                    error_message = "request: {!r}".format(ops[failed_op_index][1])
+                    raise error_class(error_message)
             else:
                 return
 
@@ -434,10 +472,10 @@ class Client:
          return self._running if self._running.done() else utils.shield(self._running)
 
     def get_loop(self) -> asyncio.AbstractEventLoop:
-        return self._session.get_loop()
+        return self._loop
 
     def get_logger(self) -> logging.Logger:
-        return self._session.get_logger()
+        return self._logger
 
     def is_running(self) -> bool:
         return not self._running.done()
@@ -445,28 +483,60 @@ class Client:
     def is_stopping(self) -> bool:
         return self._is_stopping
 
+    async def _execute_watch_operation(self, op_code: protocol.OpCode, request, auto_retry: bool
+                                       , non_error_classes: typing.Sequence[typing.Type\
+        [errors.Error]], watcher_types: _WatcherTypes) -> typing.Tuple[typing.Any, session.Watcher]:
+        watchers: typing.List[session.Watcher] = []
+        # the watcher is installed upon completion, before any later notification is handled
+        on_complete = functools.partial(self._install_watcher, request.path, watcher_types
+                                        , watchers)
+        result = await self._session.execute_operation(op_code, request, auto_retry
+                                                       , non_error_classes, on_complete)
+        assert len(watchers) == 1, repr(watchers)
+        return result, watchers[0]
+
+    def _install_watcher(self, path: str, watcher_types: _WatcherTypes
+                         , watchers: typing.List[session.Watcher]
+                         , non_error_class: typing.Optional[typing.Type[errors.Error]]) -> None:
+        watcher = session.Watcher(watcher_types[non_error_class], path, self._loop)
+        self._session.add_watcher(watcher)
+        watchers.append(watcher)
+
+    def _execute_op(self, op: protocol.Op, auto_retry: bool
+                    , auto_batch: bool) -> Coroutine[typing.Any]:
+        if auto_batch:
+            return self._execute_batched_op(op, auto_retry)
+
+        return self._session.execute_operation(*op, auto_retry)
+
+    async def _execute_batched_op(self, op: protocol.Op, auto_retry: bool) -> typing.Any:
+        # keeps the coroutine contract of the single-request methods
+        return await self._batch_coalescer.add_op(op, auto_retry)
+
     async def _run(self) -> None:
-        session_timeout = self._session.get_timeout()
+        session_ = self._session
+        server_addresses = self._server_addresses
+        logger = self._logger
+        session_timeout = session_.get_timeout()
 
         try:
             while True:
-                server_address = await self._server_addresses.allocate_item()
+                server_address = await server_addresses.allocate_item()
 
                 if server_address is None:
-                    self.get_logger().error("client connection failure: session_id={:#x}"
-                                            .format(self._session.get_id()))
+                    logger.error("client connection failure: session_id=%#x", session_.get_id())
                     break
 
-                self.get_logger().info("client connection: session_id={:#x} server_address={!r}"
-                                       .format(self._session.get_id(), server_address))
-                connect_deadline = self._server_addresses.when_next_item_allocable()
+                logger.info("client connection: session_id=%#x server_address=%r"
+                            , session_.get_id(), server_address)
+                connect_deadline = server_addresses.when_next_item_allocable()
 
                 try:
-                    await self._session.connect(*server_address, connect_deadline, self._auth_infos)
-                    session_timeout = self._session.get_timeout()
-                    self._server_addresses.reset(session_timeout / (session_timeout \
-                        - self._session.get_read_timeout()), session_timeout)
-                    await self._session.dispatch()
+                    await session_.connect(*server_address, connect_deadline, self._auth_infos)
+                    session_timeout = session_.get_timeout()
+                    server_addresses.reset(session_timeout / (session_timeout \
+                        - session_.get_read_timeout()), session_timeout)
+                    await session_.dispatch()
                 except (
                     ConnectionRefusedError,
                     ConnectionResetError,
@@ -482,23 +552,266 @@ class Client:
         ):
             pass
         except Exception:
-            self.get_logger().exception("client run failure: session_id={:#x}"
-                                        .format(self._session.get_id()))
+            logger.exception("client run failure: session_id=%#x", session_.get_id())
 
         if self._is_stopping:
-            self.get_logger().info("client stop (passive): session_id={:#x}"
-                                    .format(self._session.get_id()))
+            logger.info("client stop (passive): session_id=%#x", session_.get_id())
         else:
-            self.get_logger().info("client stop (active): session_id={:#x}"
-                                   .format(self._session.get_id()))
+            logger.info("client stop (active): session_id=%#x", session_.get_id())
             self._is_stopping = True
 
-        if not self._session.is_closed():
-            self._session.close()
+        if not session_.is_closed():
+            session_.close()
 
-        self._session.remove_all_listeners()
-        self._server_addresses.reset(1.0, session_timeout)
+        await self._batch_coalescer.close()
+        session_.remove_all_listeners()
+        server_addresses.reset(1.0, session_timeout)
         self._is_stopping = False
 
 
-_RE1 = re.compile(r"//+")
+_BatchEntry = typing.Tuple[protocol.Op, "asyncio.Future[typing.Any]"]
+
+
+class _BatchCoalescer:
+    def __init__(self, session_: session.Session, max_batch_size: int
+                 , max_batch_delay: float) -> None:
+        assert max_batch_size >= 1, repr(max_batch_size)
+        assert max_batch_delay >= 0.0, repr(max_batch_delay)
+        self._session = session_
+        self._max_batch_size = max_batch_size
+        self._max_batch_delay = max_batch_delay
+        # indexed by auto_retry
+        self._pending_entries: typing.Tuple[typing.List[_BatchEntry]
+                                            , typing.List[_BatchEntry]] = ([], [])
+        self._pending_op_sizes = [0, 0]
+        self._flush_handle: typing.Optional[asyncio.Handle] = None
+        self._tasks: typing.Set[asyncio.Task] = set()
+
+    def add_op(self, op: protocol.Op, auto_retry: bool) -> "asyncio.Future[typing.Any]":
+        # used as an index
+        auto_retry = bool(auto_retry)
+        loop = self._session.get_loop()
+        response = loop.create_future()
+        op_size = _MULTI_OP_OVERHEAD_SIZE + get_size(type(op[1]), op[1])
+
+        if _MULTI_OVERHEAD_SIZE + op_size > _MAX_MULTI_REQUEST_SIZE:
+            # too large to share a MULTI with anything, send it on its own
+            self._execute_batch_in_background([(op, response)], auto_retry)
+            return response
+
+        if _MULTI_OVERHEAD_SIZE + self._pending_op_sizes[auto_retry] + op_size \
+           > _MAX_MULTI_REQUEST_SIZE:
+            # keep the MULTI under the server's packet size limit (jute.maxbuffer)
+            self._flush_now()
+
+        pending_entries = self._pending_entries[auto_retry]
+        pending_entries.append((op, response))
+        self._pending_op_sizes[auto_retry] += op_size
+
+        if len(pending_entries) >= self._max_batch_size:
+            # a full batch need not wait any longer
+            self._flush_now()
+        elif self._flush_handle is None:
+            if self._max_batch_delay == 0.0:
+                self._flush_handle = loop.call_soon(self._flush)
+            else:
+                self._flush_handle = loop.call_later(self._max_batch_delay, self._flush)
+
+        return response
+
+    async def close(self) -> None:
+        # the session has been closed, so whatever is left fails right away
+        self._flush_now()
+
+        if len(self._tasks) >= 1:
+            await asyncio.wait(tuple(self._tasks))
+
+    def _flush_now(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+
+        self._flush()
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+
+        for auto_retry, pending_entries in enumerate(self._pending_entries):
+            entries = [entry for entry in pending_entries if not entry[1].done()]
+            pending_entries.clear()
+            self._pending_op_sizes[auto_retry] = 0
+
+            # add_op() keeps each list within both the count and the size limits
+            if len(entries) >= 1:
+                self._execute_batch_in_background(entries, bool(auto_retry))
+
+    def _execute_batch_in_background(self, entries: typing.List[_BatchEntry]
+                                     , auto_retry: bool) -> None:
+        task = self._session.get_loop().create_task(self._execute_batch(entries, auto_retry))
+        self._tasks.add(task)
+        task.add_done_callback(functools.partial(self._on_batch_done, entries))
+
+    def _on_batch_done(self, entries: typing.List[_BatchEntry], task: asyncio.Task) -> None:
+        self._tasks.discard(task)
+
+        # the task may have been cancelled before it ever ran
+        if task.cancelled():
+            for _, response in entries:
+                response.cancel()
+        else:
+            # any error has been passed on to the callers already
+            task.exception()
+
+    async def _execute_batch(self, entries: typing.List[_BatchEntry], auto_retry: bool) -> None:
+        try:
+            await self._do_execute_batch(entries, auto_retry)
+        except asyncio.CancelledError:
+            raise
+        except BaseException as error:
+            for _, response in entries:
+                if not response.done():
+                    response.set_exception(error)
+
+            raise
+
+    async def _do_execute_batch(self, entries: typing.List[_BatchEntry]
+                                , auto_retry: bool) -> None:
+        if len(entries) == 1:
+            await self._execute_single_op(entries[0], auto_retry)
+            return
+
+        try:
+            multi_response = await self._session.execute_operation(
+                _OP_MULTI,
+
+                protocol.MultiRequest(
+                    ops=tuple(op for op, _ in entries),
+                ),
+
+                auto_retry,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            for (_, request), response in entries:
+                if response.done():
+                    continue
+
+                if isinstance(error, errors.Error):
+                    error_message = "request: {!r}".format(request)
+                    response.set_exception(type(error)(error_message))
+                else:
+                    response.set_exception(error)
+
+            return
+
+        failed_op = _find_failed_op(multi_response)
+
+        if failed_op is None:
+            for (_, response), (_, op_result) in zip(entries, multi_response.op_results):
+                if not response.done():
+                    response.set_result(op_result)
+
+            return
+
+        # the transaction has been rolled back, fail the culprit and send the others on their
+        # own, pipelined, so that another failing op cannot roll them back all over again
+        failed_op_index, error_class = failed_op
+        (_, request), response = entries[failed_op_index]
+
+        if not response.done():
+            error_message = "request: {!r}".format(request)
+            response.set_exception(error_class(error_message))
+
+        await asyncio.gather(*(self._execute_single_op(entry, auto_retry)
+                               for i, entry in enumerate(entries)
+                               if i != failed_op_index and not entry[1].done()))
+
+    async def _execute_single_op(self, entry: _BatchEntry, auto_retry: bool) -> None:
+        (op_code, request), response = entry
+
+        try:
+            result = await self._session.execute_operation(op_code, request, auto_retry)
+        except asyncio.CancelledError:
+            raise
+        except Exception as error:
+            if not response.done():
+                response.set_exception(error)
+        else:
+            if not response.done():
+                response.set_result(result)
+
+def _find_failed_op(multi_response: protocol.MultiResponse) -> typing.Optional[typing.Tuple\
+    [int, typing.Type[errors.Error]]]:
+    for i, (op_code, op_result) in enumerate(multi_response.op_results):
+        if op_code is _OP_ERROR and op_result.err not in _ROLLBACK_ERROR_CODES:
+            return i, errors.get_error_class(op_result.err)
+
+    return None
+
+
+_EXISTS_WATCHER_TYPES: _WatcherTypes = {
+    None: session.WatcherType.DATA,
+    errors.NoNodeError: session.WatcherType.EXIST,
+}
+
+_GET_DATA_WATCHER_TYPES: _WatcherTypes = {
+    None: session.WatcherType.DATA,
+}
+
+_GET_CHILDREN_WATCHER_TYPES: _WatcherTypes = {
+    None: session.WatcherType.CHILD,
+}
+
+_OP_CREATE = protocol.OpCode.CREATE
+_OP_DELETE = protocol.OpCode.DELETE
+_OP_SET_DATA = protocol.OpCode.SET_DATA
+_OP_CHECK = protocol.OpCode.CHECK
+_OP_MULTI = protocol.OpCode.MULTI
+_OP_EXISTS = protocol.OpCode.EXISTS
+_OP_GET_DATA = protocol.OpCode.GET_DATA
+_OP_GET_CHILDREN = protocol.OpCode.GET_CHILDREN
+_OP_GET_CHILDREN2 = protocol.OpCode.GET_CHILDREN2
+_OP_GET_ACL = protocol.OpCode.GET_ACL
+_OP_SET_ACL = protocol.OpCode.SET_ACL
+_OP_SYNC = protocol.OpCode.SYNC
+_OP_ERROR = protocol.OpCode.ERROR
+
+
+_ROLLBACK_ERROR_CODES = (0, errors.RuntimeInconsistencyError.CODE)
+
+# well below the 1 MiB default of the server's jute.maxbuffer
+_MAX_MULTI_REQUEST_SIZE = 1 << 19
+_MULTI_OVERHEAD_SIZE = get_size(protocol.RequestHeader) + get_size(protocol.MultiRequest)
+_MULTI_OP_OVERHEAD_SIZE = get_size(protocol.MultiHeader)
+
+_MAX_DELETE_R_BATCH_SIZE = 64
+_MAX_DELETE_R_CONCURRENCY = 64
+
+_MAX_NUMBER_OF_NORMALIZED_PATHS = 4096
+
+# indexed by [ephemeral][sequential]
+_CREATE_FLAGS: typing.Tuple[typing.Tuple[protocol.CreateMode, protocol.CreateMode]
+                            , typing.Tuple[protocol.CreateMode, protocol.CreateMode]] = (
+    (protocol.CreateMode.PERSISTENT, protocol.CreateMode.PERSISTENT_SEQUENTIAL),
+    (protocol.CreateMode.EPHEMERAL, protocol.CreateMode.EPHEMERAL_SEQUENTIAL),
+)
+
+
+@functools.lru_cache(maxsize=_MAX_NUMBER_OF_NORMALIZED_PATHS)
+def _normalize_path(path: str, path_prefix: str) -> str:
+    path = _collapse_slashes(path).rstrip("/")
+
+    if path == "":
+        return "/"
+
+    if path[0] != "/":
+        path = path_prefix + path
+
+    return path
+
+
+def _collapse_slashes(path: str) -> str:
+    while "//" in path:
+        path = path.replace("//", "/")
+
+    return path
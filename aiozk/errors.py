@@ -11,7 +11,7 @@ _ERROR_CODE_2_ERROR_CLASS: typing.Dict[int, typing.Type[Error]] = {}
 def _register_error(error_code: int) -> typing.Callable[[typing.Type[Error]], typing.Type[Error]]:
     def do(error_class: typing.Type[Error]) -> typing.Type[Error]:
         assert issubclass(error_class, Error), repr(error_class)
-        assert error_class not in _ERROR_CODE_2_ERROR_CLASS.keys(), repr(error_class)
+        assert error_code not in _ERROR_CODE_2_ERROR_CLASS.keys(), repr(error_code)
         error_class.CODE = error_code
         _ERROR_CODE_2_ERROR_CLASS[error_code] = error_class
         return error_class
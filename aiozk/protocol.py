@@ -1,4 +1,5 @@
 import enum
+import struct
 import typing
 
 from .record import *
@@ -255,25 +256,14 @@ class MultiRequest(typing.NamedTuple):
     def serialize(self, buffer: bytearray) -> None:
         for op in self.ops:
             assert isinstance(op[1], get_request_class(op[0])), repr(op)
-
-            serialize_record(MultiHeader(
-                type=op[0],
-                done=False,
-                err=-1,
-            ), buffer)
-
+            buffer.extend(_MULTI_HEADER_STRUCT.pack(op[0], False, -1))
             serialize_record(op[1], buffer)
 
-        serialize_record(MultiHeader(
-            type=-1,
-            done=True,
-            err=-1,
-        ), buffer)
+        buffer.extend(_LAST_MULTI_HEADER)
 
     @classmethod
     def deserialize(cls, data: bytes, data_offset) -> typing.Tuple["MultiRequest", int]:
         ops: typing.List[Op] = []
-        data_offset = 0
 
         while True:
             multi_header: MultiHeader
@@ -282,9 +272,9 @@ class MultiRequest(typing.NamedTuple):
             if multi_header.done:
                 break
 
-            request_class = get_request_class(OpCode(multi_header.type))
-            request, data_offset = deserialize_record(request_class, data, data_offset)
-            ops.append((OpCode(multi_header.type), request))
+            op_code = OpCode(multi_header.type)
+            request, data_offset = deserialize_record(get_request_class(op_code), data, data_offset)
+            ops.append((op_code, request))
 
         return cls(tuple(ops)), data_offset
 
@@ -296,7 +286,7 @@ class MultiRequest(typing.NamedTuple):
             for op in value.ops:
                 assert isinstance(op[1], get_request_class(op[0])), repr(op)
                 size += get_size(MultiHeader)
-                get_size(type(op[1]), op[1])
+                size += get_size(type(op[1]), op[1])
 
         return size
 
@@ -309,22 +299,12 @@ class MultiResponse(typing.NamedTuple):
 
     def serialize(self, buffer: bytearray) -> None:
         for op_result in self.op_results:
-            assert isinstance(op_result[1], get_request_class(op_result[0])), repr(op_result)
+            assert isinstance(op_result[1], get_response_class(op_result[0])), repr(op_result)
             err = op_result[1].err if op_result[0] is OpCode.ERROR else 0
-
-            serialize_record(MultiHeader(
-                type=op_result[0],
-                done=False,
-                err=err,
-            ), buffer)
-
+            buffer.extend(_MULTI_HEADER_STRUCT.pack(op_result[0], False, err))
             serialize_record(op_result[1], buffer)
 
-        serialize_record(MultiHeader(
-            type=-1,
-            done=True,
-            err=-1,
-        ), buffer)
+        buffer.extend(_LAST_MULTI_HEADER)
 
     @classmethod
     def deserialize(cls, data: bytes, data_offset: int) -> typing.Tuple["MultiResponse", int]:
@@ -337,9 +317,10 @@ class MultiResponse(typing.NamedTuple):
             if multi_header.done:
                 break
 
-            response_class = get_response_class(OpCode(multi_header.type))
-            response, data_offset = deserialize_record(response_class, data, data_offset)
-            op_results.append((OpCode(multi_header.type), response))
+            op_code = OpCode(multi_header.type)
+            response, data_offset = deserialize_record(get_response_class(op_code), data
+                                                       , data_offset)
+            op_results.append((op_code, response))
 
         return cls(tuple(op_results)), data_offset
 
@@ -349,9 +330,9 @@ class MultiResponse(typing.NamedTuple):
 
         if value is not None:
             for op_result in value.op_results:
-                assert isinstance(op_result[1], get_request_class(op_result[0])), repr(op_result)
+                assert isinstance(op_result[1], get_response_class(op_result[0])), repr(op_result)
                 size += get_size(MultiHeader)
-                get_size(type(op_result[1]), op_result[1])
+                size += get_size(type(op_result[1]), op_result[1])
 
         return size
 
@@ -384,3 +365,7 @@ _OP_CODE_2_MESSAGE_CLASSES: typing.Dict[OpCode, typing.Tuple[typing.Type, typing
     OpCode.SET_WATCHES: (SetWatches, type(None)),
     OpCode.ERROR: (type(None), ErrorResponse),
 }
+
+# the wire layout of MultiHeader
+_MULTI_HEADER_STRUCT = struct.Struct(">i?i")
+_LAST_MULTI_HEADER = _MULTI_HEADER_STRUCT.pack(-1, True, -1)
@@ -11,6 +11,7 @@ __all__ = (
 )
 
 
+import struct
 import typing
 
 
@@ -23,14 +24,17 @@ Buffer = bytes
 String = str
 Vector = typing.Tuple[_T, ...]
 
+_Serializer = typing.Callable[[typing.Any, bytearray], None]
+_Deserializer = typing.Callable[[bytes, int], typing.Tuple[typing.Any, int]]
+
 
 def serialize_record(record, buffer: bytearray) -> None:
-    return _serialize_record(type(record), record, buffer)
+    _get_serializer(type(record))(record, buffer)
 
 
 def deserialize_record(record_class: typing.Type, data: bytes
                        , data_offset: int=0) -> typing.Tuple[typing.Any, int]:
-    return _deserialize_record(record_class, data, data_offset)
+    return _get_deserializer(record_class)(data, data_offset)
 
 
 def get_size(class_: typing.Type[_T], value: typing.Optional[_T]=None) -> int:
@@ -65,99 +69,286 @@ def get_size(class_: typing.Type[_T], value: typing.Optional[_T]=None) -> int:
             elif hasattr(class_, "get_size"):
                 size = class_.get_size(value)  # type: ignore
             else:
-                size = 0
+                fixed_size = _get_fixed_size(class_)
 
-                for field_name, field_class in class_._field_types.items():  # type: ignore
-                    if value is None:
-                        field_value = None
-                    else:
-                        field_value = getattr(value, field_name)
+                if fixed_size is None:
+                    size = 0
 
-                    size += get_size(field_class, field_value)
+                    for field_name, field_class in _get_fields(class_):
+                        if value is None:
+                            field_value = None
+                        else:
+                            field_value = getattr(value, field_name)
+
+                        size += get_size(field_class, field_value)
+                else:
+                    size = fixed_size
 
     return size
 
 
-def _serialize_record(record_class: typing.Type, record, buffer: bytearray) -> None:
-    if record_class is type(None):
+def _get_fixed_size(record_class: typing.Type) -> typing.Optional[int]:
+    try:
+        return _RECORD_CLASS_2_FIXED_SIZE[record_class]
+    except KeyError:
         pass
-    elif hasattr(record_class, "serialize"):
-        record.serialize(buffer)
-    else:
-        for field_name, field_class in record_class._field_types.items():
-            field_value = getattr(record, field_name)
-            _serialize_value(field_class, field_value, buffer)
 
+    fixed_size: typing.Optional[int] = 0
 
-def _deserialize_record(record_class: typing.Type, data: bytes
-                        , data_offset: int) -> typing.Tuple[typing.Any, int]:
-    if record_class is type(None):
-        record = None
-    elif hasattr(record_class, "deserialize"):
-        record, data_offset = record_class.deserialize(data, data_offset)
-    else:
-        field_values = []
+    for _, field_class in _get_fields(record_class):
+        if field_class in _FIXED_SIZE_CLASSES:
+            field_size = get_size(field_class)
+        elif field_class in (Buffer, String, type(None)) or _test_vector_class(field_class) \
+             or hasattr(field_class, "get_size"):
+            field_size = None
+        else:
+            field_size = _get_fixed_size(field_class)
+
+        if field_size is None:
+            fixed_size = None
+            break
+
+        fixed_size += field_size  # type: ignore
+
+    _RECORD_CLASS_2_FIXED_SIZE[record_class] = fixed_size
+    return fixed_size
+
+
+def _get_serializer(class_: typing.Type) -> _Serializer:
+    serializer = _CLASS_2_SERIALIZER.get(class_, None)
+
+    if serializer is None:
+        if _test_vector_class(class_):
+            serializer = _make_vector_serializer(class_)
+        elif class_ is type(None):
+            serializer = _serialize_none
+        elif hasattr(class_, "serialize"):
+            serializer = class_.serialize
+        else:
+            serializer = _make_record_serializer(class_)
+
+        _CLASS_2_SERIALIZER[class_] = serializer
+
+    return serializer
+
+
+def _get_deserializer(class_: typing.Type) -> _Deserializer:
+    deserializer = _CLASS_2_DESERIALIZER.get(class_, None)
+
+    if deserializer is None:
+        if _test_vector_class(class_):
+            deserializer = _make_vector_deserializer(class_)
+        elif class_ is type(None):
+            deserializer = _deserialize_none
+        elif hasattr(class_, "deserialize"):
+            deserializer = class_.deserialize
+        else:
+            deserializer = _make_record_deserializer(class_)
+
+        _CLASS_2_DESERIALIZER[class_] = deserializer
+
+    return deserializer
+
+
+def _make_record_serializer(record_class: typing.Type) -> _Serializer:
+    # straight-line code with the serializer of each field bound in advance
+    field_classes = tuple(field_class for _, field_class in _get_fields(record_class))
+    namespace: typing.Dict[str, typing.Any] = {}
+    lines = ["def serialize(record, buffer):"]
+
+    for i, (field_format, field_indexes) in enumerate(_group_fields(field_classes)):
+        if field_format == "":
+            namespace["serialize{}".format(i)] = _get_serializer(field_classes[field_indexes[0]])
+            lines.append("    serialize{}(record[{}], buffer)".format(i, field_indexes[0]))
+            continue
+
+        namespace["struct{}".format(i)] = struct.Struct(">" + field_format)
+        field_values = ["record[{}]".format(j) for j in field_indexes]
+        j = field_indexes[-1]
+        field_class = field_classes[j]
+
+        if field_class is String:
+            lines.append("    raw_value{0} = record[{0}].encode()".format(j))
+        elif field_class is Buffer:
+            lines.append("    raw_value{0} = record[{0}]".format(j))
+        else:
+            lines.append("    buffer.extend(struct{}.pack({}))".format(i, ", ".join(field_values)))
+            continue
+
+        # the last field is variable-size, its size ends the struct and its bytes follow
+        field_values[-1] = "len(raw_value{})".format(j)
+        lines.append("    buffer.extend(struct{}.pack({}))".format(i, ", ".join(field_values)))
+        lines.append("    buffer.extend(raw_value{})".format(j))
+
+    if len(lines) == 1:
+        lines.append("    pass")
+
+    exec("\n".join(lines), namespace)
+    return namespace["serialize"]
+
+
+def _make_record_deserializer(record_class: typing.Type) -> _Deserializer:
+    # straight-line code with the deserializer of each field bound in advance
+    field_classes = tuple(field_class for _, field_class in _get_fields(record_class))
+    namespace: typing.Dict[str, typing.Any] = {"new_tuple": tuple.__new__
+                                               , "record_class": record_class}
+    lines = ["def deserialize(data, data_offset):"]
+
+    for i, (field_format, field_indexes) in enumerate(_group_fields(field_classes)):
+        field_values = "".join("value{}, ".format(j) for j in field_indexes)
+
+        if field_format == "":
+            namespace["deserialize{}".format(i)] = _get_deserializer(field_classes\
+                [field_indexes[0]])
+            lines.append("    {}data_offset = deserialize{}(data, data_offset)"
+                         .format(field_values, i))
+            continue
+
+        struct_ = struct.Struct(">" + field_format)
+        namespace["struct{}".format(i)] = struct_
+
+        lines.extend((
+            "    next_data_offset = data_offset + {}".format(struct_.size),
+            "    if next_data_offset > len(data):",
+            "        raise ValueError(\"next_data_offset={!r} data_size={!r}\""
+            ".format(next_data_offset, len(data)))",
+            "    {}= struct{}.unpack_from(data, data_offset)".format(field_values, i),
+            "    data_offset = next_data_offset",
+        ))
+
+        j = field_indexes[-1]
+        field_class = field_classes[j]
+
+        if field_class is String:
+            decode = ".decode()"
+        elif field_class is Buffer:
+            decode = ""
+        else:
+            continue
+
+        # the last field is variable-size, what has been read so far is its size
+        lines.extend((
+            "    if value{} < 0:".format(j),
+            "        raise ValueError(\"number_of_bytes={{!r}}\".format(value{}))".format(j),
+            "    next_data_offset = data_offset + value{}".format(j),
+            "    if next_data_offset > len(data):",
+            "        raise ValueError(\"next_data_offset={!r} data_size={!r}\""
+            ".format(next_data_offset, len(data)))",
+            "    value{} = data[data_offset:next_data_offset]{}".format(j, decode),
+            "    data_offset = next_data_offset",
+        ))
+
+    all_field_values = "".join("value{}, ".format(j) for j in range(len(field_classes)))
+    # bypass __new__ and _make of the record class, the number of fields is known to match
+    lines.append("    return new_tuple(record_class, ({})), data_offset".format(all_field_values))
+    exec("\n".join(lines), namespace)
+    return namespace["deserialize"]
+
+
+def _group_fields(field_classes: typing.Sequence[typing.Type]) -> typing.List[typing.Tuple\
+    [str, typing.List[int]]]:
+    # runs of fixed-size fields are merged into one group to be (un)packed by a single struct,
+    # a run may end with a variable-size field whose size is packed along, and any other field
+    # makes a group on its own, with an empty format
+    field_groups: typing.List[typing.Tuple[str, typing.List[int]]] = []
+    run_is_open = False
+
+    for i, field_class in enumerate(field_classes):
+        field_format = _SIZED_CLASS_2_FORMAT.get(field_class, "")
+
+        if field_format != "" and run_is_open:
+            last_field_format, last_field_indexes = field_groups[-1]
+            last_field_indexes.append(i)
+            field_groups[-1] = last_field_format + field_format, last_field_indexes
+        else:
+            field_groups.append((field_format, [i]))
+
+        run_is_open = field_class in _FIXED_SIZE_CLASSES
 
-        for field_name, field_class in record_class._field_types.items():
-            field_value, data_offset = _deserialize_value(field_class, data, data_offset)
-            field_values.append(field_value)
+    return field_groups
 
-        record = record_class._make(field_values)
 
-    return record, data_offset
+def _make_vector_serializer(vector_class: typing.Type) -> _Serializer:
+    serialize_element = _get_serializer(_get_element_class(vector_class))
 
+    def serialize_vector(vector: Vector, buffer: bytearray) -> None:
+        _serialize_int(len(vector), buffer)
 
-def _serialize_vector(vector_class: typing.Type, vector: Vector, buffer: bytearray) -> None:
-    _serialize_int(len(vector), buffer)
+        for element_value in vector:
+            serialize_element(element_value, buffer)
+
+    return serialize_vector
+
+
+def _make_vector_deserializer(vector_class: typing.Type) -> _Deserializer:
     element_class = _get_element_class(vector_class)
 
-    for element_value in vector:
-        _serialize_value(element_class, element_value, buffer)
+    if element_class is String:
+        return _deserialize_string_vector
+
+    deserialize_element = _get_deserializer(element_class)
+
+    def deserialize_vector(data: bytes, data_offset: int) -> typing.Tuple[Vector, int]:
+        number_of_elements, data_offset = _deserialize_int(data, data_offset)
+
+        if number_of_elements < 0:
+            raise ValueError("number_of_elements={!r}".format(number_of_elements))
+
+        element_values = []
+
+        for _ in range(number_of_elements):
+            element_value, data_offset = deserialize_element(data, data_offset)
+            element_values.append(element_value)
 
+        vector = tuple(element_values)
+        return vector, data_offset
 
-def _deserialize_vector(vector_class: typing.Type, data: bytes
-                        , data_offset: int) -> typing.Tuple[Vector, int]:
+    return deserialize_vector
+
+
+def _deserialize_string_vector(data: bytes, data_offset: int) -> typing.Tuple[Vector[String], int]:
+    # inlined version of the generic loop for e.g. the children of a znode
     number_of_elements, data_offset = _deserialize_int(data, data_offset)
 
     if number_of_elements < 0:
         raise ValueError("number_of_elements={!r}".format(number_of_elements))
 
-    element_values = []
-    element_class = _get_element_class(vector_class)
+    unpack_int = _INT_STRUCT.unpack_from
+    data_size = len(data)
+    strings = []
 
     for _ in range(number_of_elements):
-        element_value, data_offset = _deserialize_value(element_class, data, data_offset)
-        element_values.append(element_value)
+        next_data_offset = data_offset + 4
 
-    vector = tuple(element_values)
-    return vector, data_offset
+        if next_data_offset > data_size:
+            raise ValueError("next_data_offset={!r} data_size={!r}".format(next_data_offset
+                                                                         , data_size))
 
+        number_of_bytes, = unpack_int(data, data_offset)
 
-def _serialize_value(class_: typing.Type, value, buffer: bytearray) -> None:
-    serdes = _PRIMITIVE_CLASS_2_SERDES.get(class_, None)
+        if number_of_bytes < 0:
+            raise ValueError("number_of_bytes={!r}".format(number_of_bytes))
 
-    if serdes is None:
-        if _test_vector_class(class_):
-            _serialize_vector(class_, value, buffer)
-        else:
-            _serialize_record(class_, value, buffer)
-    else:
-        serdes[0](value, buffer)
+        data_offset = next_data_offset
+        next_data_offset = data_offset + number_of_bytes
 
+        if next_data_offset > data_size:
+            raise ValueError("next_data_offset={!r} data_size={!r}".format(next_data_offset
+                                                                         , data_size))
 
-def _deserialize_value(class_: typing.Type, data: bytes
-                       , data_offset: int) -> typing.Tuple[typing.Any, int]:
-    serdes = _PRIMITIVE_CLASS_2_SERDES.get(class_, None)
+        strings.append(data[data_offset:next_data_offset].decode())
+        data_offset = next_data_offset
+
+    vector = tuple(strings)
+    return vector, data_offset
 
-    if serdes is None:
-        if _test_vector_class(class_):
-            value, data_offset = _deserialize_vector(class_, data, data_offset)
-        else:
-            value, data_offset = _deserialize_record(class_, data, data_offset)
-    else:
-        value, data_offset = serdes[1](data, data_offset)
 
-    return value, data_offset
+def _serialize_none(none: None, buffer: bytearray) -> None:
+    pass
+
+
+def _deserialize_none(data: bytes, data_offset: int) -> typing.Tuple[None, int]:
+    return None, data_offset
 
 
 def _serialize_boolean(boolean: Boolean, buffer: bytearray) -> None:
@@ -179,7 +370,7 @@ def _deserialize_boolean(data: bytes, data_offset: int) -> typing.Tuple[Boolean,
 
 
 def _serialize_int(int_: Int, buffer: bytearray) -> None:
-    buffer.extend(int_.to_bytes(4, "big", signed=True))
+    buffer.extend(_INT_STRUCT.pack(int_))
 
 
 def _deserialize_int(data: bytes, data_offset: int) -> typing.Tuple[Int, int]:
@@ -188,13 +379,13 @@ def _deserialize_int(data: bytes, data_offset: int) -> typing.Tuple[Int, int]:
     if next_data_offset > len(data):
         raise ValueError("next_data_offset={!r} data_size={!r}".format(next_data_offset, len(data)))
 
-    int_ = int.from_bytes(data[data_offset:next_data_offset], "big", signed=True)
+    int_, = _INT_STRUCT.unpack_from(data, data_offset)
     data_offset = next_data_offset
     return int_, data_offset
 
 
 def _serialize_long(long: Long, buffer: bytearray) -> None:
-    buffer.extend(long.to_bytes(8, "big", signed=True))
+    buffer.extend(_LONG_STRUCT.pack(long))
 
 
 def _deserialize_long(data: bytes, data_offset: int) -> typing.Tuple[Long, int]:
@@ -203,13 +394,13 @@ def _deserialize_long(data: bytes, data_offset: int) -> typing.Tuple[Long, int]:
     if next_data_offset > len(data):
         raise ValueError("next_data_offset={!r} data_size={!r}".format(next_data_offset, len(data)))
 
-    long = Long(int.from_bytes(data[data_offset:next_data_offset], "big", signed=True))
+    long, = _LONG_STRUCT.unpack_from(data, data_offset)
     data_offset = next_data_offset
     return long, data_offset
 
 
 def _serialize_buffer(buffer1: Buffer, buffer2: bytearray) -> None:
-    _serialize_int(len(buffer1), buffer2)
+    buffer2.extend(_INT_STRUCT.pack(len(buffer1)))
     buffer2.extend(buffer1)
 
 
@@ -231,7 +422,7 @@ def _deserialize_buffer(data: bytes, data_offset: int) -> typing.Tuple[Buffer, i
 
 def _serialize_string(string: String, buffer: bytearray) -> None:
     raw_value = string.encode()
-    _serialize_int(len(raw_value), buffer)
+    buffer.extend(_INT_STRUCT.pack(len(raw_value)))
     buffer.extend(raw_value)
 
 
@@ -252,24 +443,60 @@ def _deserialize_string(data: bytes, data_offset: int) -> typing.Tuple[String, i
     return string, data_offset
 
 
+def _get_fields(record_class: typing.Type) -> typing.Tuple[typing.Tuple[str, typing.Type], ...]:
+    try:
+        return _RECORD_CLASS_2_FIELDS[record_class]
+    except KeyError:
+        pass
+
+    # NamedTuple._field_types is gone since Python 3.9, __annotations__ works everywhere
+    fields = tuple(record_class.__annotations__.items())
+    _RECORD_CLASS_2_FIELDS[record_class] = fields
+    return fields
+
+
 def _test_vector_class(class_: typing.Type) -> bool:
-    return hasattr(class_, "_subs_tree")
+    # only parameterized generics (Vector[...]) carry an origin
+    return getattr(class_, "__origin__", None) is not None
 
 
 def _get_element_class(vector_class: typing.Type) -> typing.Type:
-    element_class = vector_class._subs_tree()[1]
+    return vector_class.__args__[0]
+
+
+_FIXED_SIZE_CLASSES = (Boolean, Int, Long)
 
-    if isinstance(element_class, tuple):
-        element_class = element_class[0][element_class[1:]]
+# the format of either the value, or the size of the value which is variable-size
+_SIZED_CLASS_2_FORMAT: typing.Dict[typing.Any, str] = {
+    Boolean: "?",
+    Int: "i",
+    Long: "q",
+    Buffer: "i",
+    String: "i",
+}
+
+_RECORD_CLASS_2_FIELDS: typing.Dict[typing.Any, typing.Tuple[typing.Tuple[str, typing.Type], ...]] \
+    = {}
 
-    return element_class
+# None for record classes whose size depends on the value
+_RECORD_CLASS_2_FIXED_SIZE: typing.Dict[typing.Any, typing.Optional[int]] = {}
 
+_INT_STRUCT = struct.Struct(">i")
+_LONG_STRUCT = struct.Struct(">q")
+
+# vector and record classes are added on first use
+_CLASS_2_SERIALIZER: typing.Dict[typing.Any, _Serializer] = {
+    Boolean: _serialize_boolean,
+    Int: _serialize_int,
+    Long: _serialize_long,
+    Buffer: _serialize_buffer,
+    String: _serialize_string,
+}
 
-_PRIMITIVE_CLASS_2_SERDES: typing.Dict[typing.Any, typing.Tuple[typing.Callable
-                                                                , typing.Callable]] = {
-    Boolean: (_serialize_boolean, _deserialize_boolean),
-    Int: (_serialize_int, _deserialize_int),
-    Long: (_serialize_long, _deserialize_long),
-    Buffer: (_serialize_buffer, _deserialize_buffer),
-    String: (_serialize_string, _deserialize_string),
+_CLASS_2_DESERIALIZER: typing.Dict[typing.Any, _Deserializer] = {
+    Boolean: _deserialize_boolean,
+    Int: _deserialize_int,
+    Long: _deserialize_long,
+    Buffer: _deserialize_buffer,
+    String: _deserialize_string,
 }
@@ -11,7 +11,7 @@ import async_generator
 from . import errors
 from . import protocol
 from .record import *
-from .transport import Transport
+from .transport import MESSAGE_SIZE_SIZE, Transport
 
 
 class SessionState(enum.IntEnum):
@@ -38,6 +38,8 @@ class SessionEventType(enum.IntEnum):
 
 
 class SessionListener:
+    __slots__ = ("_state_changes",)
+
     def __init__(self) -> None:
         self._state_changes: typing.Optional[asyncio.Queue[typing.Optional[typing.Tuple\
             [SessionState, SessionEventType]]]] = None
@@ -58,10 +60,12 @@ class WatcherType(enum.IntEnum):
 
 
 class Watcher:
+    __slots__ = ("_type", "_path", "_event")
+
     def __init__(self, type_: WatcherType, path: str, loop: asyncio.AbstractEventLoop) -> None:
         self._type = type_
         self._path = path
-        self._event: asyncio.Future[protocol.WatcherEventType] = utils.Future(loop=loop)
+        self._event: asyncio.Future[protocol.WatcherEventType] = loop.create_future()
 
     def get_type(self) -> WatcherType:
         return self._type
@@ -112,9 +116,9 @@ class Session:
         self._pending_operations1: Deque[_Operation] = Deque(_MAX_NUMBER_OF_PENDING_OPERATIONS
                                                              , self.get_loop())
         self._pending_operations2: typing.Dict[int, _Operation] = {}
-        self._watchers: typing.Tuple[typing.Dict[str, typing.Set[Watcher]]
-                                     , typing.Dict[str, typing.Set[Watcher]]
-                                     , typing.Dict[str, typing.Set[Watcher]]] = ({}, {}, {})
+        self._watchers: typing.Tuple[typing.Dict[str, typing.List[Watcher]]
+                                     , typing.Dict[str, typing.List[Watcher]]
+                                     , typing.Dict[str, typing.List[Watcher]]] = ({}, {}, {})
 
     def add_listener(self) -> SessionListener:
         listener = SessionListener()
@@ -199,11 +203,11 @@ class Session:
         path_2_watchers = self._watchers[watcher._type]
         watchers = path_2_watchers.get(watcher._path, None)
 
+        # each watcher is added exactly once and never taken out on its own
         if watchers is None:
-            watchers = set()
-            path_2_watchers[watcher._path] = watchers
-
-        watchers.add(watcher)
+            path_2_watchers[watcher._path] = [watcher]
+        else:
+            watchers.append(watcher)
 
     def get_loop(self) -> asyncio.AbstractEventLoop:
         return self._transport.get_loop()
@@ -265,7 +269,7 @@ class Session:
                 self._pending_operations1.commit_item_removals(len(self._pending_operations2))
 
                 for operation in self._pending_operations2.values():
-                    if operation.response.cancelled():
+                    if operation.response.done():
                         continue
 
                     if need_retry and operation.auto_retry:
@@ -286,7 +290,7 @@ class Session:
                     if operation is None:
                         break
 
-                    if operation.response.cancelled():
+                    if operation.response.done():
                         continue
 
                     error_message = "request: {!r}".format(operation.request)
@@ -295,7 +299,7 @@ class Session:
                 self._pending_operations1.close(error_class2)
 
                 for operation in self._pending_operations2.values():
-                    if operation.response.cancelled():
+                    if operation.response.done():
                         continue
 
                     error_message = "request: {!r}".format(operation.request)
@@ -346,7 +350,7 @@ class Session:
     @async_generator.asynccontextmanager
     async def _do_connect(self, transport: Transport
                           , connect_deadline: float) -> typing.AsyncIterator[None]:
-        buffer = bytearray()
+        buffer = bytearray(MESSAGE_SIZE_SIZE)
 
         request = protocol.ConnectRequest(
             protocol_version=_PROTOCOL_VERSION,
@@ -357,7 +361,7 @@ class Session:
         )
 
         serialize_record(request, buffer)
-        transport.write(buffer)
+        transport.write_framed(buffer)
         connect_timeout = max(connect_deadline - time.monotonic(), 0.0)
         data = await transport.read(connect_timeout)
         response: protocol.ConnectResponse
@@ -381,11 +385,11 @@ class Session:
         self._password = response.passwd
 
     def _do_close(self, transport: Transport) -> None:
-        buffer = bytearray()
+        buffer = bytearray(MESSAGE_SIZE_SIZE)
         request_header = protocol.RequestHeader(xid=self._get_xid()
                                                 , type=protocol.OpCode.CLOSE_SESSION)
         serialize_record(request_header, buffer)
-        transport.write(buffer)
+        transport.write_framed(buffer)
 
     async def _authenticate(self, transport: Transport, connect_deadline: float
                             , auth_infos: typing.Iterable[AuthInfo]) -> None:
@@ -447,11 +451,11 @@ class Session:
     async def _execute_operation(self, transport: Transport, read_timeout: float, xid: int
                                  , op_code: protocol.OpCode, request):
         assert isinstance(request, protocol.get_request_class(op_code)), repr((op_code, request))
-        buffer = bytearray()
+        buffer = bytearray(MESSAGE_SIZE_SIZE)
         request_header = protocol.RequestHeader(xid=xid, type=op_code)
         serialize_record(request_header, buffer)
         serialize_record(request, buffer)
-        transport.write(buffer)
+        transport.write_framed(buffer)
 
         while True:
             data = await transport.read(read_timeout)
@@ -484,28 +488,77 @@ class Session:
 
     async def _send_requests(self) -> None:
         loop = self.get_loop()
+        transport = self._transport
+        last_write_time = loop.time()
+        keep_alive_handle: asyncio.TimerHandle
 
-        while True:
-            operation = self._pending_operations1.try_remove_head(False)
-
-            if operation is None:
-                try:
-                    operation = await utils.wait_for2(self._pending_operations1.remove_head(False)
-                                                      , self._get_min_ping_interval(), loop=loop)
-                except asyncio.TimeoutError:
-                    buffer = bytearray()
-                    request_header = protocol.RequestHeader(xid=-2, type=protocol.OpCode.PING)
-                    serialize_record(request_header, buffer)
-                    self._transport.write(buffer)
+        # one timer for the connection, sending a ping only once the connection went idle
+        def keep_alive() -> None:
+            nonlocal last_write_time, keep_alive_handle
+
+            if transport.is_closed():
+                return
+
+            ping_interval = self._get_min_ping_interval()
+            idle_time = loop.time() - last_write_time
+
+            if idle_time >= ping_interval:
+                transport.write(_PING_REQUEST)
+                last_write_time = loop.time()
+                idle_time = 0.0
+
+            keep_alive_handle = loop.call_later(ping_interval - idle_time, keep_alive)
+
+        keep_alive_handle = loop.call_later(self._get_min_ping_interval(), keep_alive)
+
+        try:
+            while True:
+                operation = self._pending_operations1.try_remove_head(False)
+
+                if operation is None:
+                    operation = await self._pending_operations1.remove_head(False)
+
+                # send the operations ready so far with one write, a bounded number at a time
+                messages = []
+                sent_operations: typing.List[typing.Tuple[int, _Operation]] = []
+
+                while True:
+                    buffer = bytearray(MESSAGE_SIZE_SIZE)
+                    xid = self._get_xid()
+                    request_header = protocol.RequestHeader(xid=xid, type=operation.op_code)
+
+                    try:
+                        serialize_record(request_header, buffer)
+                        serialize_record(operation.request, buffer)
+                    except Exception as error:
+                        # fail only the operation at fault, the others still go out
+                        self._pending_operations1.commit_item_removals(1)
+
+                        if not operation.response.done():
+                            operation.response.set_exception(error)
+                    else:
+                        messages.append(buffer)
+                        sent_operations.append((xid, operation))
+
+                        if len(messages) == _MAX_NUMBER_OF_MESSAGES_PER_WRITE:
+                            break
+
+                    operation = self._pending_operations1.try_remove_head(False)
+
+                    if operation is None:
+                        break
+
+                if len(messages) == 0:
                     continue
 
-            buffer = bytearray()
-            xid = self._get_xid()
-            request_header = protocol.RequestHeader(xid=xid, type=operation.op_code)  # type: ignore
-            serialize_record(request_header, buffer)
-            serialize_record(operation.request, buffer)  # type: ignore
-            self._transport.write(buffer)
-            self._pending_operations2[xid] = operation  # type: ignore
+                transport.write_framed_messages(messages)
+                last_write_time = loop.time()
+
+                # only operations actually written wait for replies
+                for xid, operation in sent_operations:
+                    self._pending_operations2[xid] = operation
+        finally:
+            keep_alive_handle.cancel()
 
     async def _receive_responses(self) -> None:
         while True:
@@ -605,6 +658,19 @@ _FINAL_SESSION_STATES = _FINAL_SESSION_STATE_2_ERROR_CLASS.keys()
 
 _PROTOCOL_VERSION = 0
 
+_MAX_NUMBER_OF_MESSAGES_PER_WRITE = 256
+
+
+def _make_ping_request() -> bytes:
+    buffer = bytearray()
+    request_header = protocol.RequestHeader(xid=-2, type=protocol.OpCode.PING)
+    serialize_record(request_header, buffer)
+    return bytes(buffer)
+
+
+# byte-identical every time, so serialized once
+_PING_REQUEST = _make_ping_request()
+
 _MAX_SETWATCHES_SIZE = 1 << 17
 _SETWATCHES_OVERHEAD_SIZE = get_size(protocol.RequestHeader) + get_size(protocol.SetWatches)
 _STRING_OVERHEAD_SIZE = get_size(protocol.String)
@@ -1,5 +1,7 @@
 import asyncio
+import collections
 import logging
+import struct
 import typing
 
 from asyncio_toolkit import utils
@@ -20,8 +22,8 @@ class Transport:
             self._logger = logger
 
         self._is_closed = True
-        self._stream_reader: asyncio.StreamReader
-        self._stream_writer: asyncio.StreamWriter
+        self._socket_transport: asyncio.Transport
+        self._protocol: _Protocol
 
     def connect(self, host_name: str, port_number: int, connect_timeout: float) -> Coroutine[None]:
         assert self._is_closed
@@ -30,17 +32,29 @@ class Transport:
 
     def write(self, message: BytesLike) -> None:
         assert not self._is_closed
-        message_size = len(message)
-        self._stream_writer.write(message_size.to_bytes(4, "big"))
-        self._stream_writer.write(message)
+        self._socket_transport.writelines((_MESSAGE_SIZE_STRUCT.pack(len(message)), message))
+
+    def write_framed(self, buffer: bytearray) -> None:
+        # the first MESSAGE_SIZE_SIZE bytes of the buffer are reserved for the message size
+        assert not self._is_closed
+        _MESSAGE_SIZE_STRUCT.pack_into(buffer, 0, len(buffer) - _MESSAGE_SIZE_STRUCT.size)
+        self._socket_transport.write(buffer)
+
+    def write_framed_messages(self, buffers: typing.Sequence[bytearray]) -> None:
+        assert not self._is_closed
+
+        for buffer in buffers:
+            _MESSAGE_SIZE_STRUCT.pack_into(buffer, 0, len(buffer) - _MESSAGE_SIZE_STRUCT.size)
+
+        self._socket_transport.writelines(buffers)
 
     def read(self, read_timeout: float) -> Coroutine[bytes]:
         assert not self._is_closed
-        return utils.wait_for1(self._read(), read_timeout, loop=self._loop)
+        return self._protocol.read_message(read_timeout)
 
     def close(self) -> None:
         assert not self._is_closed
-        self._stream_writer.close()
+        self._socket_transport.close()
         self._is_closed = True
 
     def get_loop(self) -> asyncio.AbstractEventLoop:
@@ -53,11 +67,156 @@ class Transport:
         return self._is_closed
 
     async def _connect(self, host_name: str, port_number: int) -> None:
-        self._stream_reader, self._stream_writer = await asyncio.open_connection(host_name\
-            , port_number, loop=self._loop)
+        self._socket_transport, self._protocol = await self._loop.create_connection(
+            lambda: _Protocol(self._loop), host_name, port_number)  # type: ignore
         self._is_closed = False
 
-    async def _read(self) -> bytes:
-        message_size = int.from_bytes(await self._stream_reader.readexactly(4), "big")
-        message = await self._stream_reader.readexactly(message_size)
+
+# splits the incoming byte stream into messages as data arrives
+class _Protocol(asyncio.Protocol):
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._transport: asyncio.Transport
+        self._buffer = bytearray()
+        self._next_frame_size = _MESSAGE_SIZE_STRUCT.size
+        self._messages: typing.Deque[bytes] = collections.deque()
+        self._error: typing.Optional[Exception] = None
+        self._waiter: typing.Optional[asyncio.Future] = None
+        self._read_deadline = 0.0
+        self._read_timer: typing.Optional[asyncio.TimerHandle] = None
+        self._read_timer_deadline = 0.0
+        self._reading_is_paused = False
+
+    def data_received(self, data: bytes) -> None:
+        buffer = self._buffer
+
+        if len(buffer) >= 1:
+            buffer.extend(data)
+
+            # wait for the whole frame before copying the buffer out
+            if len(buffer) < self._next_frame_size:
+                return
+
+            data = bytes(buffer)
+            buffer.clear()
+
+        data_size = len(data)
+        data_offset = 0
+
+        while True:
+            message_offset = data_offset + _MESSAGE_SIZE_STRUCT.size
+
+            if message_offset > data_size:
+                self._next_frame_size = _MESSAGE_SIZE_STRUCT.size
+                break
+
+            message_size, = _MESSAGE_SIZE_STRUCT.unpack_from(data, data_offset)
+
+            if message_size < 0:
+                # a corrupted stream, give up the connection and let the session reconnect
+                self._error = ConnectionResetError("message_size={!r}".format(message_size))
+                self._wake_up()
+                self._buffer.clear()
+                self._transport.abort()
+                return
+
+            next_data_offset = message_offset + message_size
+
+            if next_data_offset > data_size:
+                self._next_frame_size = _MESSAGE_SIZE_STRUCT.size + message_size
+                break
+
+            self._messages.append(data[message_offset:next_data_offset])
+            data_offset = next_data_offset
+
+        if data_offset < data_size:
+            buffer.extend(memoryview(data)[data_offset:])
+
+        if len(self._messages) >= 1:
+            # stop buffering messages which nobody reads, until the backlog has drained
+            if len(self._messages) >= _MESSAGES_HIGH_WATER_MARK and not self._reading_is_paused:
+                self._transport.pause_reading()
+                self._reading_is_paused = True
+
+            self._wake_up()
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport  # type: ignore
+
+    def eof_received(self) -> None:
+        self._set_error(asyncio.IncompleteReadError(bytes(self._buffer), self._next_frame_size))
+
+    def connection_lost(self, exception: typing.Optional[Exception]) -> None:
+        if self._read_timer is not None:
+            self._read_timer.cancel()
+            self._read_timer = None
+
+        if exception is None:
+            self._set_error(asyncio.IncompleteReadError(bytes(self._buffer)
+                                                        , self._next_frame_size))
+        else:
+            self._set_error(exception)
+
+    async def read_message(self, read_timeout: float) -> bytes:
+        if len(self._messages) == 0:
+            self._read_deadline = self._loop.time() + read_timeout
+
+            # one timer shared by successive reads, only moved earlier if ever needed
+            if self._read_timer is None:
+                self._arm_read_timer()
+            elif self._read_timer_deadline > self._read_deadline:
+                self._read_timer.cancel()
+                self._arm_read_timer()
+
+            while len(self._messages) == 0:
+                if self._error is not None:
+                    raise self._error
+
+                self._waiter = self._loop.create_future()
+
+                try:
+                    await self._waiter
+                finally:
+                    self._waiter = None
+
+        message = self._messages.popleft()
+
+        if self._reading_is_paused and len(self._messages) <= _MESSAGES_LOW_WATER_MARK:
+            self._transport.resume_reading()
+            self._reading_is_paused = False
+
         return message
+
+    def _arm_read_timer(self) -> None:
+        self._read_timer = self._loop.call_at(self._read_deadline, self._check_read_deadline)
+        self._read_timer_deadline = self._read_deadline
+
+    def _check_read_deadline(self) -> None:
+        self._read_timer = None
+        waiter = self._waiter
+
+        if waiter is None or waiter.done():
+            return
+
+        if self._loop.time() >= self._read_deadline:
+            waiter.set_exception(asyncio.TimeoutError())
+        else:
+            self._arm_read_timer()
+
+    def _set_error(self, error: Exception) -> None:
+        if self._error is None:
+            self._error = error
+
+        self._wake_up()
+
+    def _wake_up(self) -> None:
+        waiter = self._waiter
+
+        if waiter is not None and not waiter.done():
+            waiter.set_result(None)
+
+
+_MESSAGE_SIZE_STRUCT = struct.Struct(">i")
+MESSAGE_SIZE_SIZE = _MESSAGE_SIZE_STRUCT.size
+_MESSAGES_HIGH_WATER_MARK = 1024
+_MESSAGES_LOW_WATER_MARK = 256